@@ -7,8 +7,20 @@ Captures frames from camera, detects potholes, and logs GPS coordinates
 import time
 import os
 import cv2
+import functools
 import json
+import numpy as np
+import logging
+import logging.handlers
+import math
+import numbers
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import NamedTuple, Optional
+from PIL import Image
+from requests.adapters import HTTPAdapter
 from landingai.pipeline.frameset import Frame
 from landingai.predict import Predictor
 
@@ -24,25 +36,133 @@ except ImportError:
 # Alternative GPS using serial (for USB GPS dongles)
 try:
     import serial
-    import pynmea2
     SERIAL_GPS_AVAILABLE = True
 except ImportError:
     SERIAL_GPS_AVAILABLE = False
 
+# Faster JSON serialization for detection data (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# On-device pre-filter model (optional, TensorRT and PyCUDA ship with JetPack)
+try:
+    import tensorrt as trt
+    import pycuda.driver as cuda
+    TENSORRT_AVAILABLE = True
+except ImportError:
+    TENSORRT_AVAILABLE = False
+
+# GPU preprocessing (requires OpenCV built with CUDA, as shipped with JetPack)
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
 # YOUR LANDING AI CREDENTIALS 
 ENDPOINT_ID = "your-endpoint-id-here"
 API_KEY = "land_sk_your-api-key-here"
 
 # CONFIGURATION
 CAMERA_ID = 0           # Whichever camera works for you
+CAMERA_BACKEND = "auto"  # "usb" (V4L2 MJPEG via GStreamer), "csi" (nvarguscamerasrc), "opencv", or "auto"
+CAMERA_MJPEG_DECODER = "jpegdec"  # Use "nvjpegdec" to decode USB MJPEG in hardware on Jetson
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
 CAPTURE_INTERVAL = 1.0  # Seconds between captures
 CONFIDENCE_THRESHOLD = 0.5  # Minimum confidence to consider a detection
 SHOW_CAMERA = True      # Show live camera feed
+JPEG_QUALITY = 85       # Quality of saved detection images
+DISPLAY_EVERY_N_FRAMES = 3  # Only redraw the live feed on every Nth frame
+
+# INFERENCE CONFIGURATION
+MAX_IN_FLIGHT_REQUESTS = 4  # Landing AI requests allowed to overlap (including rate-limit backoff)
+MAX_QUEUED_ANALYSES = 8     # Frames waiting for Landing AI; the oldest is dropped when full
+
+# LOCAL PRE-FILTER CONFIGURATION
+PREFILTER_ENABLED = True        # Only send frames with pothole-like edges to Landing AI
+PREFILTER_MIN_CONTOUR_AREA = 500  # Minimum contour area (pixels) to count as a candidate
+PREFILTER_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+# Road region checked for candidates, a trapezoid in the lower frame standing in for a road
+# segmentation mask. Keeps the horizon, sky, roadside and most of the traffic out of the check
+PREFILTER_ROAD_TOP = 0.55        # Fraction of frame height where the road region starts
+PREFILTER_ROAD_TOP_WIDTH = 0.4   # Fraction of frame width covered by the region's top edge (bottom edge is full width)
+# Optional INT8 TensorRT engine for a candidate-region model, e.g. built with:
+#   trtexec --onnx=model.onnx --int8 --calib=calib.cache --saveEngine=filter.plan
+PREFILTER_ENGINE_PATH = None
+PREFILTER_MIN_SCORE = 0.3       # Minimum model score to send a frame to Landing AI
+
+# DUPLICATE FRAME CONFIGURATION
+# Off by default: a forward road view hashes nearly the same while driving, so this is
+# only safe for setups that are parked for long stretches without a GPS speed
+DEDUPE_MAX_HAMMING_DISTANCE = 0  # Without a GPS speed, skip frames whose 64-bit dHash differs from the last sent by fewer bits (0 disables)
+MIN_ANALYSIS_SPEED = 0.5         # m/s; with a GPS speed (GPSD, or serial RMC), analyze only at or above this
+
+# GPU CONFIGURATION
+USE_CUDA_PREPROCESSING = True  # Do color conversion on the Jetson GPU when available
 
 # GPS CONFIGURATION
 GPS_METHOD = "auto"     # "gpsd", "serial", "mock", or "auto"
 GPS_SERIAL_PORT = "/dev/ttyUSB0"  # For USB GPS dongles
 GPS_BAUDRATE = 9600     # Standard GPS baud rate
+GPS_POLL_INTERVAL = 0.2  # Seconds between background GPS reads
+GPS_SERIAL_BUFFER_LIMIT = 4096  # Drop buffered serial bytes if no line ending shows up within this many
+GPS_SPEED_MAX_AGE = 2.0  # Seconds a reported speed stays valid without a fresh fix
+
+KNOTS_TO_MPS = 0.514444
+
+def _nmea_fields(sentence):
+    """Split an NMEA sentence into fields, or None if its checksum doesn't match"""
+    sentence = sentence.strip()
+    
+    # Validate the checksum when one is present
+    star = sentence.find('*')
+    if star != -1:
+        checksum = 0
+        for byte in sentence[1:star].encode('ascii', errors='replace'):
+            checksum ^= byte
+        if sentence[star + 1:star + 3].upper() != f"{checksum:02X}":
+            return None
+        sentence = sentence[:star]
+    
+    return sentence.split(',')
+
+def parse_gga(sentence):
+    """Parse a $GPGGA/$GNGGA sentence into a location dict, or None without a valid fix"""
+    # Fields: 2-3 latitude ddmm.mmmm N/S, 4-5 longitude dddmm.mmmm E/W,
+    # 6 fix quality, 7 satellites, 9 altitude (m)
+    parts = _nmea_fields(sentence)
+    if parts is None or len(parts) < 10 or not parts[2] or not parts[4] or parts[6] in ('', '0'):
+        return None
+    
+    latitude = float(parts[2][:2]) + float(parts[2][2:]) / 60
+    if parts[3] == 'S':
+        latitude = -latitude
+    longitude = float(parts[4][:3]) + float(parts[4][3:]) / 60
+    if parts[5] == 'W':
+        longitude = -longitude
+    
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "altitude": float(parts[9]) if parts[9] else 0.0,
+        "speed": 0.0,  # Not available in GGA
+        "timestamp": datetime.now().isoformat(),
+        "fix_quality": int(parts[6]),
+        "satellites": int(parts[7]) if parts[7] else 0
+    }
+
+def parse_rmc_speed(sentence):
+    """Ground speed in m/s from a $GPRMC/$GNRMC sentence, or None without a valid fix"""
+    # Fields: 2 status (A = valid), 7 speed over ground (knots)
+    parts = _nmea_fields(sentence)
+    if parts is None or len(parts) < 8 or parts[2] != 'A' or not parts[7]:
+        return None
+    
+    return float(parts[7]) * KNOTS_TO_MPS
 
 class GPSTracker:
     """Handle GPS location tracking with multiple methods"""
@@ -51,13 +171,23 @@ class GPSTracker:
         self.method = method
         self.gps_connection = None
         self.serial_connection = None
+        self.serial_buffer = bytearray()
         self.last_known_location = None
+        self.current_location = None
+        # (speed in m/s, time.monotonic() it was reported), replaced as a whole by the poll thread
+        self.speed_reading = None
+        self.location_lock = threading.Lock()
+        self.poll_thread = None
+        self.polling = False
         self.mock_location = {
             "latitude": 39.6846,   # Irvine, CA (example, use gpa modeule for exact)
             "longitude": -127.8265,
             "altitude": 90.0,
             "speed": 0.0
         }
+        # Pre-generated mock movement jitter, cycled through as a ring buffer
+        self.mock_jitter = np.random.default_rng().uniform(-0.0001, 0.0001, (1024, 2)).tolist()
+        self.mock_jitter_index = 0
         
         self.initialize_gps()
     
@@ -117,8 +247,47 @@ class GPSTracker:
         
         return False
     
+    def start(self):
+        """Poll the GPS on a background thread so get_location() never blocks"""
+        if self.poll_thread is not None:
+            return
+        
+        self.polling = True
+        self.poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self.poll_thread.start()
+    
+    def stop(self):
+        """Stop background polling"""
+        self.polling = False
+        if self.poll_thread is not None:
+            self.poll_thread.join(timeout=2)
+            self.poll_thread = None
+    
+    def _poll_loop(self):
+        while self.polling:
+            location = self.read_location()
+            with self.location_lock:
+                self.current_location = location
+            # Serial sentences queue up in the OS buffer meanwhile and are read in bulk next poll
+            time.sleep(GPS_POLL_INTERVAL)
+    
     def get_location(self):
-        """Get current GPS location"""
+        """Get current GPS location (latest polled value when polling in the background)"""
+        if self.poll_thread is not None:
+            with self.location_lock:
+                return self.current_location
+        
+        return self.read_location()
+    
+    def get_speed(self):
+        """Ground speed in m/s from a recent fix, or None if unknown or the fix has gone stale"""
+        reading = self.speed_reading
+        if reading is None or time.monotonic() - reading[1] > GPS_SPEED_MAX_AGE:
+            return None
+        return reading[0]
+    
+    def read_location(self):
+        """Read GPS location directly from the device"""
         
         if self.method == "gpsd":
             return self._get_gpsd_location()
@@ -144,46 +313,616 @@ class GPSTracker:
                     "satellites": packet.sats
                 }
                 self.last_known_location = location
+                self.speed_reading = (packet.hspeed, time.monotonic())
                 return location
         except Exception as e:
             print(f"GPS read error: {e}")
         
+        # The last known location is still worth tagging, but its speed no longer describes the vehicle
+        self.speed_reading = None
         return self.last_known_location
     
+    def _read_serial_lines(self):
+        """Read everything the port has buffered in one call and return the complete lines"""
+        # pyserial's readline() reads one byte per call; read(in_waiting) takes the whole backlog
+        # accumulated since the last poll. With nothing waiting, read(1) blocks up to the port
+        # timeout for the next byte.
+        self.serial_buffer += self.serial_connection.read(self.serial_connection.in_waiting or 1)
+        
+        end = self.serial_buffer.rfind(b'\n')
+        if end == -1:
+            if len(self.serial_buffer) > GPS_SERIAL_BUFFER_LIMIT:
+                self.serial_buffer.clear()
+            return []
+        
+        lines = self.serial_buffer[:end].split(b'\n')
+        del self.serial_buffer[:end + 1]
+        return lines
+    
     def _get_serial_location(self):
         """Get location from serial GPS"""
         try:
-            line = self.serial_connection.readline().decode('ascii', errors='replace')
-            if line.startswith('$GPGGA') or line.startswith('$GNGGA'):
-                msg = pynmea2.parse(line)
-                if msg.latitude and msg.longitude:
-                    location = {
-                        "latitude": float(msg.latitude),
-                        "longitude": float(msg.longitude),
-                        "altitude": float(msg.altitude) if msg.altitude else 0.0,
-                        "speed": 0.0,  # Not available in GGA
-                        "timestamp": datetime.now().isoformat(),
-                        "fix_quality": int(msg.gps_qual),
-                        "satellites": int(msg.num_sats)
-                    }
-                    self.last_known_location = location
-                    return location
+            lines = self._read_serial_lines()
         except Exception as e:
             print(f"Serial GPS read error: {e}")
+            return self.last_known_location
+        
+        for line in lines:
+            # Only decode GGA (position) and RMC (speed) sentences; others are skipped while still bytes
+            is_gga = line.startswith(b'$GPGGA') or line.startswith(b'$GNGGA')
+            is_rmc = line.startswith(b'$GPRMC') or line.startswith(b'$GNRMC')
+            if not (is_gga or is_rmc):
+                continue
+            
+            # A malformed sentence must not discard the valid fixes after it
+            try:
+                sentence = line.decode('ascii', errors='replace')
+                if is_rmc:
+                    speed = parse_rmc_speed(sentence)
+                    if speed is not None:
+                        self.speed_reading = (speed, time.monotonic())
+                    continue
+                location = parse_gga(sentence)
+            except Exception as e:
+                print(f"Serial GPS parse error: {e}")
+                continue
+            if location:
+                speed = self.get_speed()
+                if speed is not None:
+                    location["speed"] = speed
+                self.last_known_location = location
         
         return self.last_known_location
     
     def _get_mock_location(self):
         """Get mock location (for testing without GPS)"""
         # Simulate movement by slightly changing coordinates
-        import random
-        location = self.mock_location.copy()
-        location["latitude"] += random.uniform(-0.0001, 0.0001)
-        location["longitude"] += random.uniform(-0.0001, 0.0001)
-        location["timestamp"] = datetime.now().isoformat()
-        location["fix_quality"] = 1
-        location["satellites"] = 8
-        return location
+        lat_jitter, lon_jitter = self.mock_jitter[self.mock_jitter_index]
+        self.mock_jitter_index = (self.mock_jitter_index + 1) & 1023
+        
+        # A fresh dict per reading: analysis jobs keep a reference to the location they were queued with
+        return {
+            "latitude": self.mock_location["latitude"] + lat_jitter,
+            "longitude": self.mock_location["longitude"] + lon_jitter,
+            "altitude": self.mock_location["altitude"],
+            "speed": self.mock_location["speed"],
+            "timestamp": datetime.now().isoformat(),
+            "fix_quality": 1,
+            "satellites": 8
+        }
+
+def frame_dhash(gray):
+    """64-bit difference hash of a grayscale frame, for spotting near-identical frames"""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+_road_masks = {}
+
+def road_mask(height, width):
+    """Trapezoid mask of the road region, for a crop starting at PREFILTER_ROAD_TOP (cached per size)"""
+    mask = _road_masks.get((height, width))
+    if mask is None:
+        top_inset = int(width * (1 - PREFILTER_ROAD_TOP_WIDTH) / 2)
+        corners = np.array([[top_inset, 0], [width - 1 - top_inset, 0],
+                            [width - 1, height - 1], [0, height - 1]], dtype=np.int32)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [corners], 255)
+        _road_masks[(height, width)] = mask
+    return mask
+
+def has_pothole_candidates(gray):
+    """Cheap on-device check of a grayscale frame's road region for pothole-like edge contours
+    
+    Coarse: lane markings, patches and shadows on the road still pass. It only screens out
+    frames with no edge structure on the road surface at all.
+    """
+    road = gray[int(gray.shape[0] * PREFILTER_ROAD_TOP):]
+    edges = cv2.Canny(road, 100, 200)
+    edges = cv2.dilate(edges, PREFILTER_KERNEL, iterations=3)
+    edges = cv2.bitwise_and(edges, road_mask(*road.shape))
+    
+    # OpenCV 3 returns (image, contours, hierarchy), OpenCV 4 returns (contours, hierarchy)
+    contours = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    for contour in contours:
+        if cv2.contourArea(contour) >= PREFILTER_MIN_CONTOUR_AREA:
+            return True
+    
+    return False
+
+def _bbox_from_sequence(bbox_obj):
+    return bbox_obj[:4] if len(bbox_obj) >= 4 else None
+
+def _bbox_from_dict(bbox_obj):
+    return (bbox_obj.get('x1', bbox_obj.get('left', 0)),
+            bbox_obj.get('y1', bbox_obj.get('top', 0)),
+            bbox_obj.get('x2', bbox_obj.get('right', 0)),
+            bbox_obj.get('y2', bbox_obj.get('bottom', 0)))
+
+def _bbox_from_attributes(bbox_obj):
+    return (bbox_obj.x1, bbox_obj.y1, bbox_obj.x2, bbox_obj.y2)
+
+# Bbox formats returned by the SDK, keyed by type for a single lookup per prediction
+BBOX_EXTRACTORS = {
+    tuple: _bbox_from_sequence,
+    list: _bbox_from_sequence,
+    np.ndarray: _bbox_from_sequence,
+    dict: _bbox_from_dict
+}
+
+def extract_bbox(bboxes):
+    """Normalize a prediction's bboxes into {'x1', 'y1', 'x2', 'y2'}, or None if unrecognized"""
+    bbox_obj = bboxes[0] if isinstance(bboxes, list) else bboxes
+    
+    extractor = BBOX_EXTRACTORS.get(type(bbox_obj))
+    if extractor is None and isinstance(bbox_obj, (list, tuple)):  # Subclasses, e.g. namedtuples
+        extractor = _bbox_from_sequence
+    if extractor is None and hasattr(bbox_obj, 'x1'):  # Object with attributes
+        extractor = _bbox_from_attributes
+    if extractor is None:
+        print(f"   Unknown bbox format: {type(bbox_obj)}")
+        return None
+    
+    # Check every coordinate: int() raising here would lose the frame's other detections too
+    coords = extractor(bbox_obj)
+    if coords is None or not all(isinstance(c, numbers.Real) and math.isfinite(c) for c in coords):
+        print(f"   Invalid bbox coordinates: {bbox_obj}")
+        return None
+    
+    x1, y1, x2, y2 = map(int, coords)
+    return {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
+
+class CachedTimeFormatter(logging.Formatter):
+    """Log formatter that only re-formats the timestamp when the second changes"""
+    
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self.cached_second = None
+        self.cached_stamp = ''
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self.cached_second:
+            self.cached_second = second
+            self.cached_stamp = time.strftime(datefmt or self.datefmt, time.localtime(second))
+        return self.cached_stamp
+
+class Detection(NamedTuple):
+    """A Landing AI prediction normalized once for post-processing"""
+    confidence: float
+    label: str
+    bbox: Optional[dict]
+
+def to_detections(predictions, min_confidence):
+    """Convert SDK predictions scoring at least min_confidence into Detections in one pass"""
+    detections = []
+    for pred in predictions:
+        confidence = getattr(pred, 'score', 0)
+        if confidence < min_confidence:
+            continue
+        
+        # Extract bounding box if available
+        bboxes = getattr(pred, 'bboxes', None)
+        detections.append(Detection(
+            confidence=confidence,
+            label=getattr(pred, 'label_name', 'pothole'),
+            bbox=extract_bbox(bboxes) if bboxes else None
+        ))
+    
+    return detections
+
+def start_daily_logger(log_filepath):
+    """Route daily log messages through a queue drained by a background file writer"""
+    file_handler = logging.FileHandler(log_filepath)
+    file_handler.setFormatter(CachedTimeFormatter('[%(asctime)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
+    
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    
+    logger = logging.getLogger("pothole_detector")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    
+    listener.start()
+    return logger, listener
+
+class StatusOverlay:
+    """Status text rendered into a scratch layer only when it changes, then blitted onto frames"""
+    
+    def __init__(self):
+        self.key = None
+        self.layer = None
+        self.bands = []
+    
+    def update(self, key, shape, make_lines):
+        """Re-render the text from make_lines() if key changed; lines are (text, (x, y), color)"""
+        if key == self.key and self.layer is not None and self.layer.shape == shape:
+            return
+        
+        self.key = key
+        if self.layer is None or self.layer.shape != shape:
+            self.layer = np.zeros(shape, dtype=np.uint8)
+        else:
+            for y0, y1, _ in self.bands:
+                self.layer[y0:y1] = 0
+        
+        rows = []
+        for text, origin, color in make_lines():
+            cv2.putText(self.layer, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            (_, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            rows.append((max(0, origin[1] - text_height - 2), min(shape[0], origin[1] + baseline + 2)))
+        
+        # Only the rows holding text are copied onto each frame
+        self.bands = [(y0, y1, self.layer[y0:y1].any(axis=2, keepdims=True)) for y0, y1 in rows]
+    
+    def blit(self, frame):
+        """Draw the cached text onto frame in place"""
+        for y0, y1, mask in self.bands:
+            np.copyto(frame[y0:y1], self.layer[y0:y1], where=mask)
+
+class GpuColorConverter:
+    """Convert BGR camera frames to RGB on the GPU, reusing device buffers between frames"""
+    
+    def __init__(self):
+        self.enabled = USE_CUDA_PREPROCESSING and CUDA_AVAILABLE
+        self.gpu_bgr = None
+        self.gpu_rgb = None
+        self.host_rgb = None
+    
+    def to_rgb(self, opencv_frame):
+        """Return an RGB version of a BGR frame
+        
+        On the GPU path the result lives in a reused host buffer and is only valid
+        until the next call; callers must copy it (PIL.Image.fromarray does).
+        """
+        if not self.enabled:
+            return cv2.cvtColor(opencv_frame, cv2.COLOR_BGR2RGB)
+        
+        height, width = opencv_frame.shape[:2]
+        if self.gpu_bgr is None or self.gpu_bgr.size() != (width, height):
+            # Allocate device and host buffers once per frame size
+            self.gpu_bgr = cv2.cuda_GpuMat(height, width, cv2.CV_8UC3)
+            self.gpu_rgb = cv2.cuda_GpuMat(height, width, cv2.CV_8UC3)
+            self.host_rgb = np.empty((height, width, 3), dtype=np.uint8)
+        
+        self.gpu_bgr.upload(opencv_frame)
+        cv2.cuda.cvtColor(self.gpu_bgr, cv2.COLOR_BGR2RGB, self.gpu_rgb)
+        self.host_rgb = self.gpu_rgb.download(self.host_rgb)
+        return self.host_rgb
+
+def gstreamer_pipeline(backend):
+    """GStreamer pipeline string for a USB (MJPEG) or CSI camera"""
+    caps = f"width={CAMERA_WIDTH},height={CAMERA_HEIGHT},framerate={CAMERA_FPS}/1"
+    # drop/max-buffers keep appsink from queueing stale frames
+    sink = "video/x-raw,format=BGR ! appsink drop=true max-buffers=1"
+    
+    if backend == "csi":
+        return (f"nvarguscamerasrc sensor-id={CAMERA_ID} ! video/x-raw(memory:NVMM),{caps} ! "
+                f"nvvidconv ! video/x-raw,format=BGRx ! videoconvert ! {sink}")
+    
+    return (f"v4l2src device=/dev/video{CAMERA_ID} ! image/jpeg,{caps} ! "
+            f"{CAMERA_MJPEG_DECODER} ! videoconvert ! {sink}")
+
+def open_camera():
+    """Open the camera, preferring a GStreamer MJPEG pipeline over OpenCV's default capture"""
+    backends = ["usb", "opencv"] if CAMERA_BACKEND == "auto" else [CAMERA_BACKEND]
+    
+    for backend in backends:
+        if backend == "opencv":
+            cap = cv2.VideoCapture(CAMERA_ID)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        else:
+            cap = cv2.VideoCapture(gstreamer_pipeline(backend), cv2.CAP_GSTREAMER)
+        
+        if cap.isOpened():
+            # Keep at most one frame queued so reads return the newest frame
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            print(f"Camera opened with {backend} backend")
+            return cap
+        
+        print(f"Camera {backend} backend not available")
+        cap.release()
+    
+    return None
+
+class LatestFrameReader:
+    """Grab camera frames on a background thread so reads always return the newest frame
+    
+    Frames are retrieved into three preallocated buffers: one being written by the grab
+    thread, the latest complete frame, and the one last handed out by read(). A frame
+    returned by read() stays valid until the next read() call; copy it to keep it longer.
+    """
+    
+    def __init__(self, cap):
+        self.cap = cap
+        self.condition = threading.Condition()
+        self.buffers = [np.empty((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8) for _ in range(3)]
+        self.latest_index = None
+        self.reading_index = None
+        self.frame_id = 0
+        self.read_id = 0
+        self.failed = False
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+    
+    def _run(self):
+        while self.running:
+            with self.condition:
+                write_index = next(i for i in range(3) if i not in (self.latest_index, self.reading_index))
+            
+            # Grabbing continuously drains the driver queue; older frames are simply replaced
+            ret = self.cap.grab()
+            if ret:
+                # OpenCV reallocates the buffer if the camera's real size differs from the preallocation
+                ret, frame = self.cap.retrieve(self.buffers[write_index])
+            
+            with self.condition:
+                if ret:
+                    self.buffers[write_index] = frame
+                    self.latest_index = write_index
+                    self.frame_id += 1
+                else:
+                    self.failed = True
+                self.condition.notify_all()
+            
+            if not ret:
+                break
+    
+    def read(self):
+        """Wait for a frame newer than the last one read. Returns (ret, frame) like cap.read()
+        
+        Blocks like cap.read() until a frame arrives, since GStreamer/CSI pipelines can take
+        several seconds to start; returns (False, None) only once the grab thread has failed.
+        """
+        with self.condition:
+            while self.frame_id == self.read_id and not self.failed:
+                # Wake up periodically so Ctrl+C is handled promptly
+                self.condition.wait(timeout=1.0)
+            if self.frame_id == self.read_id:
+                return False, None
+            
+            self.read_id = self.frame_id
+            self.reading_index = self.latest_index
+            return True, self.buffers[self.reading_index]
+
+def save_jpeg(filepath, opencv_frame):
+    """Encode a frame to JPEG once in memory and write the bytes in a single call"""
+    ok, jpeg_buffer = cv2.imencode('.jpg', opencv_frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not ok:
+        raise RuntimeError(f"JPEG encoding failed for {filepath}")
+    
+    with open(filepath, 'wb') as f:
+        f.write(jpeg_buffer)
+
+def write_json(filepath, data):
+    """Serialize data to indented JSON (orjson when installed) and write it in one call"""
+    if ORJSON_AVAILABLE:
+        data_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data_bytes = json.dumps(data, indent=2).encode('utf-8')
+    
+    with open(filepath, 'wb') as f:
+        f.write(data_bytes)
+
+def frame_to_blob(opencv_frame, width, height):
+    """Resize, BGR->RGB, scale to [0, 1] and HWC->NCHW in a single native call for a local model"""
+    # blobFromImage resizes first, so the channel swap and float conversion only touch
+    # the (smaller) model-sized image instead of making full-frame passes
+    return cv2.dnn.blobFromImage(opencv_frame, scalefactor=1.0 / 255, size=(width, height),
+                                 swapRB=True, crop=False)
+
+def tune_predictor_session(predictor, pool_size=MAX_IN_FLIGHT_REQUESTS):
+    """Size the predictor's keep-alive connection pool for concurrent requests. Returns True if tuned"""
+    # Predictor keeps one requests.Session for all calls; if the pool is smaller than the
+    # number of concurrent requests, urllib3 discards connections and each new one pays
+    # a fresh TCP + TLS handshake
+    session = getattr(predictor, "_session", None)
+    if session is None:
+        return False
+    
+    for prefix, adapter in list(session.adapters.items()):
+        session.mount(prefix, HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                          max_retries=adapter.max_retries))
+    session.headers["Connection"] = "keep-alive"
+    return True
+
+class TensorRTPrefilter:
+    """INT8 TensorRT candidate-region model that scores frames before they go to Landing AI
+    
+    Expects one NCHW float32 RGB input and one output holding either a pothole
+    probability or a per-pixel mask; the frame score is the maximum output value.
+    """
+    
+    def __init__(self, engine_path):
+        # Share the primary context with OpenCV's CUDA module
+        cuda.init()
+        self.cuda_context = cuda.Device(0).retain_primary_context()
+        self.cuda_context.push()
+        
+        try:
+            self._load_engine(engine_path)
+        except Exception:
+            # Don't leave the context pushed on the caller's thread if setup fails
+            self.cuda_context.pop()
+            raise
+    
+    def _load_engine(self, engine_path):
+        self.runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, 'rb') as f:
+            self.engine = self.runtime.deserialize_cuda_engine(f.read())
+        if self.engine is None:
+            raise RuntimeError(f"Could not deserialize TensorRT engine {engine_path}")
+        self.context = self.engine.create_execution_context()
+        
+        if hasattr(self.engine, 'get_tensor_shape'):
+            # Named-tensor API (TensorRT 8.5+, the only option from TensorRT 10)
+            input_name, output_name = (self.engine.get_tensor_name(i) for i in range(2))
+            self.input_shape = tuple(self.engine.get_tensor_shape(input_name))
+            output_shape = tuple(self.engine.get_tensor_shape(output_name))
+        else:
+            self.input_shape = tuple(self.engine.get_binding_shape(0))
+            output_shape = tuple(self.engine.get_binding_shape(1))
+        if any(dim < 0 for dim in self.input_shape + output_shape):
+            raise RuntimeError("Dynamic-shape engines are not supported; build with fixed input dimensions")
+        
+        # Zero-copy mapped host buffers: the Jetson GPU reads and writes the same DRAM,
+        # so no host<->device copies are needed around inference
+        self.host_input = cuda.pagelocked_empty(self.input_shape, np.float32,
+                                                mem_flags=cuda.host_alloc_flags.DEVICEMAP)
+        self.host_output = cuda.pagelocked_empty(output_shape, np.float32,
+                                                 mem_flags=cuda.host_alloc_flags.DEVICEMAP)
+        self.bindings = [int(self.host_input.base.get_device_pointer()),
+                         int(self.host_output.base.get_device_pointer())]
+    
+    def score(self, opencv_frame):
+        """Pothole score for a BGR frame"""
+        _, _, height, width = self.input_shape
+        np.copyto(self.host_input, frame_to_blob(opencv_frame, width, height))
+        self.context.execute_v2(self.bindings)
+        return float(self.host_output.max())
+    
+    def close(self):
+        self.cuda_context.pop()
+
+def run_predict_with_retry(frame, predictor, max_retries=3, retry_delay=5):
+    """Send a frame to Landing AI, backing off on rate limits. Returns True on success"""
+    for attempt in range(max_retries):
+        try:
+            frame.run_predict(predictor=predictor)
+            return True
+        except Exception as e:
+            if "429" in str(e) or "Too Many Requests" in str(e):
+                if attempt < max_retries - 1:
+                    print(f"   Rate limited, waiting {retry_delay} seconds...")
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    print("   ❌ Rate limit exceeded, skipping frame")
+            else:
+                print(f"   ❌ Analysis failed: {e}")
+                break
+
+    return False
+
+class InferenceWorker:
+    """Run queued analysis jobs on one shared predictor, overlapping up to max_in_flight requests"""
+
+    def __init__(self, predictor, handle_result, handle_dropped, max_in_flight=MAX_IN_FLIGHT_REQUESTS,
+                 max_queued=MAX_QUEUED_ANALYSES):
+        self.predictor = predictor
+        self.handle_result = handle_result
+        self.handle_dropped = handle_dropped
+        # Bounded so frame copies can't pile up while Landing AI is slow, rate limiting or down
+        self.jobs = queue.Queue(maxsize=max_queued)
+        # The SDK has no batch endpoint, so jobs are fanned out over a thread pool and
+        # a job can start while earlier ones are still in flight or backing off
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.futures = []  # Requests not yet seen done; replaced as a whole by the worker thread
+        # Results complete on pool threads; handle them one at a time
+        self.result_lock = threading.Lock()
+        # Only the worker thread touches the converter, so its GPU buffers need no locking
+        self.color_converter = GpuColorConverter()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.stopping = threading.Event()
+
+    def __enter__(self):
+        self.worker.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Drop jobs that haven't started, so quitting waits only on requests already in flight
+        self.stopping.set()
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self._drop(job, "Shutting down")
+        
+        # The worker may itself be waiting for a slot, so report before joining it
+        pending = sum(not future.done() for future in self.futures)
+        if pending:
+            print(f"Waiting for {pending} in-flight Landing AI request(s)...")
+        self.jobs.put(None)
+        self.worker.join()
+        self.executor.shutdown(wait=True)
+        return False
+
+    def submit(self, job):
+        """Queue a job (dict with at least the BGR 'image') for analysis
+        
+        Never blocks. If the queue is full the oldest queued job is dropped to make room.
+        """
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            try:
+                self._drop(self.jobs.get_nowait(), "Backlog full")
+            except queue.Empty:
+                pass
+            # The capture loop is the only producer, so the freed slot is still available
+            self.jobs.put_nowait(job)
+
+    def _drop(self, job, reason):
+        with self.result_lock:
+            self.handle_dropped(job, reason)
+
+    def _prepare(self, job):
+        """Build the Landing AI Frame for a job, or None if the image can't be converted"""
+        try:
+            # Hand the pixels to the SDK directly instead of round-tripping through disk.
+            # fromarray copies RGB data, so the converter's reused buffer can't be overwritten under it
+            rgb_image = self.color_converter.to_rgb(job['image'])
+            return Frame(image=Image.fromarray(rgb_image))
+        except Exception as e:
+            print(f"   ❌ Failed to prepare frame: {e}")
+            return None
+
+    def _predict(self, frame):
+        """Run one Frame through Landing AI, returning it analysed or None"""
+        if frame is not None and run_predict_with_retry(frame, self.predictor):
+            return frame
+        return None
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            
+            # Convert only once a request slot is free, so waiting jobs hold just the BGR copy
+            self.in_flight.acquire()
+            if self.stopping.is_set():
+                # Shutdown began while this job waited for a slot, so it never started
+                self.in_flight.release()
+                self._drop(job, "Shutting down")
+                continue
+            frame = self._prepare(job)
+            future = self.executor.submit(self._predict, frame)
+            self.futures = [f for f in self.futures if not f.done()] + [future]
+            future.add_done_callback(functools.partial(self._finish, job))
+
+    def _finish(self, job, future):
+        try:
+            with self.result_lock:
+                self.handle_result(job, future.result())
+        finally:
+            self.in_flight.release()
 
 def capture_with_opencv_and_gps():
     """Main function with GPS tracking"""
@@ -199,6 +938,7 @@ def capture_with_opencv_and_gps():
     
     # Initialize GPS
     gps_tracker = GPSTracker(GPS_METHOD)
+    gps_tracker.start()
     
     # Create output directories
     output_dir = "pothole_detections"
@@ -218,23 +958,33 @@ def capture_with_opencv_and_gps():
             endpoint_id=ENDPOINT_ID,
             api_key=API_KEY
         )
+        if not tune_predictor_session(predictor):
+            print("Landing AI session not exposed, using SDK connection defaults")
         print("✅ Connected to Landing AI")
     except Exception as e:
         print(f"❌ Failed to connect to Landing AI: {e}")
         return
     
+    # Load the on-device pre-filter model, if configured
+    prefilter_model = None
+    if PREFILTER_ENGINE_PATH:
+        if not TENSORRT_AVAILABLE:
+            print("TensorRT/PyCUDA not available - pre-filter model disabled")
+        else:
+            try:
+                prefilter_model = TensorRTPrefilter(PREFILTER_ENGINE_PATH)
+                print(f"✅ Loaded pre-filter engine: {PREFILTER_ENGINE_PATH}")
+            except Exception as e:
+                print(f"❌ Failed to load pre-filter engine: {e}")
+    
     # Initialize camera
     print(f"🔍 Opening camera {CAMERA_ID}...")
-    cap = cv2.VideoCapture(CAMERA_ID)
+    cap = open_camera()
     
-    if not cap.isOpened():
+    if cap is None:
         print(f"❌ Cannot open camera {CAMERA_ID}")
         return
     
-    # Set camera properties
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    
     print(f"✅ Camera {CAMERA_ID} opened successfully")
     print(f"Capturing every {CAPTURE_INTERVAL} seconds")
     print("Camera feed will be displayed with GPS info")
@@ -249,238 +999,232 @@ def capture_with_opencv_and_gps():
     detection_count = 0
     last_capture_time = 0
     analysis_count = 0
+    analyzed_count = 0
+    dropped_count = 0
+    filtered_count = 0
+    unchanged_count = 0
+    last_submitted_hash = None
+    images_saved = 0
+    data_files_created = 0
     
     # Create daily log file
     daily_log_filename = f"detection_log_{datetime.now().strftime('%Y%m%d')}.log"
     daily_log_filepath = os.path.join(logs_dir, daily_log_filename)
     
-    def log_to_daily_file(message):
-        """Write message to daily log file"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        with open(daily_log_filepath, 'a') as f:
-            f.write(f"[{timestamp}] {message}\n")
+    daily_logger, log_listener = start_daily_logger(daily_log_filepath)
     
-    # Log session start
-    log_to_daily_file(f"Session started - Camera {CAMERA_ID}, Interval {CAPTURE_INTERVAL}s")
-    print(f"Daily log: {daily_log_filename}")
+    def log_to_daily_file(message):
+        """Queue message for the daily log file"""
+        daily_logger.info(message)
     
-    try:
-        while True:
-            # Read frame from camera
-            ret, opencv_frame = cap.read()
-            if not ret:
-                print("❌ Failed to read from camera")
-                break
+    def process_results(job, frame):
+        """Handle Landing AI results for one analysis job (runs on an inference thread)"""
+        nonlocal detection_count, images_saved, data_files_created, analyzed_count
+        
+        opencv_frame = job['image']
+        timestamp = job['timestamp']
+        current_location = job['location']
+        analysis_id = job['analysis_id']
+        
+        try:
+            if frame is None:
+                log_to_daily_file(f"Analysis failed - No response (Analysis #{analysis_id})")
+                return
             
-            # Get current GPS location
-            current_location = gps_tracker.get_location()
+            analyzed_count += 1
+            print(f"   Sent to Landing AI (Analysis #{analysis_id})")
             
-            # Show live camera feed with GPS overlay
-            if SHOW_CAMERA:
-                display_frame = opencv_frame.copy()
-                
-                # Add text overlays
-                cv2.putText(display_frame, f"Frames: {frame_count} | Analyzed: {analysis_count} | Detections: {detection_count}", 
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                
-                next_analysis = max(0, CAPTURE_INTERVAL - (time.time() - last_capture_time))
-                cv2.putText(display_frame, f"Next analysis in: {next_analysis:.1f}s", 
-                           (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+            # Process results
+            if hasattr(frame, 'predictions') and frame.predictions:
+                detections = to_detections(frame.predictions, CONFIDENCE_THRESHOLD)
+                potholes_found = len(detections)
+                detections_data = [
+                    {
+                        'confidence': detection.confidence,
+                        'label': detection.label,
+                        'bbox': detection.bbox,
+                        'gps_location': current_location,
+                        'timestamp': timestamp,
+                        'analysis_id': analysis_id
+                    }
+                    for detection in detections
+                ]
                 
-                # GPS information overlay
-                if current_location:
-                    gps_text = f"GPS: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}"
-                    cv2.putText(display_frame, gps_text, 
-                               (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                if potholes_found > 0:
+                    detection_count += potholes_found
+                    print(f"   POTHOLE DETECTED! Found {potholes_found} pothole(s)")
+                    
+                    # Print detection details
+                    for i, detection in enumerate(detections_data):
+                        print(f"      Detection {i+1}: {detection['confidence']:.2f} confidence")
+                        if current_location:
+                            print(f"         GPS: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}")
+                    
+                    # Save detection image and data
+                    final_filename = f"pothole_{timestamp}.jpg"
+                    final_filepath = os.path.join(screenshots_dir, final_filename)
+                    save_jpeg(final_filepath, opencv_frame)
+                    images_saved += 1
+                    
+                    # Save detailed JSON data
+                    data_filename = f"pothole_{timestamp}_data.json"
+                    data_filepath = os.path.join(logs_dir, data_filename)
+                    
+                    full_data = {
+                        'timestamp': timestamp,
+                        'analysis_id': analysis_id,
+                        'image_file': final_filename,
+                        'gps_location': current_location,
+                        'detections': detections_data,
+                        'total_detections': potholes_found,
+                        'camera_settings': {
+                            'width': CAMERA_WIDTH,
+                            'height': CAMERA_HEIGHT,
+                            'camera_id': CAMERA_ID
+                        }
+                    }
+                    
+                    write_json(data_filepath, full_data)
+                    data_files_created += 1
+                    
+                    # Log to daily file
+                    log_message = f"POTHOLE DETECTED - Count: {potholes_found}, Image: {final_filename}"
+                    if current_location:
+                        log_message += f", GPS: {current_location['latitude']:.6f},{current_location['longitude']:.6f}"
+                    log_to_daily_file(log_message)
+                    
+                    print(f"   Saved: {final_filename}")
+                    print(f"   Data: {data_filename}")
                     
-                    sat_text = f"Satellites: {current_location.get('satellites', 'N/A')} | Quality: {current_location.get('fix_quality', 'N/A')}"
-                    cv2.putText(display_frame, sat_text, 
-                               (10, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
                 else:
-                    cv2.putText(display_frame, "GPS: No fix", 
-                               (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-                
-                cv2.putText(display_frame, "Press 'q' to quit", 
-                           (10, display_frame.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                
-                cv2.imshow('Pothole Detection with GPS', display_frame)
-                
-                # Check for quit key
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    print("User pressed 'q' to quit")
-                    break
-            
-            frame_count += 1
-            
-            # Check if it's time to analyze
-            current_time = time.time()
-            if current_time - last_capture_time < CAPTURE_INTERVAL:
-                continue
-            
-            last_capture_time = current_time
-            analysis_count += 1
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            
-            print(f"Analysis {analysis_count} (Frame {frame_count}): {timestamp}")
-            if current_location:
-                print(f"   Location: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}")
+                    print("   ✅ No potholes detected")
+                    log_to_daily_file(f"Frame analyzed - No detections (Analysis #{analysis_id})")
+            else:
+                print("   ✅ No potholes detected")
+                log_to_daily_file(f"Frame analyzed - No detections (Analysis #{analysis_id})")
+                    
+        except Exception as e:
+            print(f"   ❌ Analysis failed: {e}")
+            log_to_daily_file(f"Analysis failed - Error: {str(e)}")
+        
+        # Print summary every 5 completed analyses (jobs finish out of order, so not by ID)
+        if analyzed_count % 5 == 0:
+            summary_msg = f"Summary: {analyzed_count} analyses, {detection_count} potholes found"
+            print(f" {summary_msg}")
+            log_to_daily_file(summary_msg)
+    
+    def process_dropped(job, reason):
+        """Record an analysis job discarded before it was sent to Landing AI"""
+        nonlocal dropped_count
+        
+        dropped_count += 1
+        print(f"   Dropped Analysis #{job['analysis_id']} ({reason})")
+        log_to_daily_file(f"Analysis dropped - {reason} (Analysis #{job['analysis_id']})")
+    
+    status_overlay = StatusOverlay()
+    
+    def status_lines(current_location, current_time, frame_height):
+        """Text lines for the live feed overlay"""
+        next_analysis = max(0, CAPTURE_INTERVAL - (current_time - last_capture_time))
+        lines = [
+            (f"Frames: {frame_count} | Analyzed: {analysis_count} | Detections: {detection_count}", (10, 30), (0, 255, 0)),
+            (f"Next analysis in: {next_analysis:.1f}s", (10, 55), (255, 0, 0))
+        ]
+        
+        # GPS information overlay
+        if current_location:
+            gps_text = f"GPS: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}"
+            lines.append((gps_text, (10, 80), (0, 255, 255)))
             
-            try:
-                # Save frame temporarily
-                temp_filename = f"temp_frame_{timestamp}.jpg"
-                temp_filepath = os.path.join(screenshots_dir, temp_filename)
-                cv2.imwrite(temp_filepath, opencv_frame)
-                
-                # Create Landing AI Frame
-                frame = Frame.from_image(temp_filepath)
+            sat_text = f"Satellites: {current_location.get('satellites', 'N/A')} | Quality: {current_location.get('fix_quality', 'N/A')}"
+            lines.append((sat_text, (10, 105), (0, 255, 255)))
+        else:
+            lines.append(("GPS: No fix", (10, 80), (0, 0, 255)))
+        
+        lines.append(("Press 'q' to quit", (10, frame_height - 20), (255, 255, 255)))
+        return lines
+    
+    # Log session start
+    log_to_daily_file(f"Session started - Camera {CAMERA_ID}, Interval {CAPTURE_INTERVAL}s")
+    print(f"Daily log: {daily_log_filename}")
+    
+    frame_reader = LatestFrameReader(cap).start()
+    
+    try:
+        with InferenceWorker(predictor, process_results, process_dropped) as inference:
+            while True:
+                # Read frame from camera
+                ret, opencv_frame = frame_reader.read()
+                if not ret:
+                    print("❌ Failed to read from camera")
+                    break
                 
-                # Send to Landing AI with retry logic
-                max_retries = 3
-                retry_delay = 5
+                frame_count += 1
                 
-                for attempt in range(max_retries):
-                    try:
-                        frame.run_predict(predictor=predictor)
-                        print("   Sent to Landing AI")
-                        break
-                    except Exception as e:
-                        if "429" in str(e) or "Too Many Requests" in str(e):
-                            if attempt < max_retries - 1:
-                                print(f"   Rate limited, waiting {retry_delay} seconds...")
-                                time.sleep(retry_delay)
-                                retry_delay *= 2
-                            else:
-                                print("   ❌ Rate limit exceeded, skipping frame")
-                                os.remove(temp_filepath)
-                                continue
-                        else:
-                            print(f"   ❌ Analysis failed: {e}")
-                            os.remove(temp_filepath)
-                            break
+                # Get current GPS location
+                current_location = gps_tracker.get_location()
                 
-                # Process results
-                if hasattr(frame, 'predictions') and frame.predictions:
-                    potholes_found = 0
-                    detections_data = []
+                # Check if it's time to analyze
+                current_time = time.time()
+                if current_time - last_capture_time >= CAPTURE_INTERVAL:
+                    last_capture_time = current_time
                     
-                    for pred in frame.predictions:
-                        confidence = getattr(pred, 'score', 0)
-                        if confidence >= CONFIDENCE_THRESHOLD:
-                            potholes_found += 1
-                            
-                            # Extract bounding box if available
-                            bbox = None
-                            if hasattr(pred, 'bboxes') and pred.bboxes:
-                                try:
-                                    bbox_obj = pred.bboxes[0] if isinstance(pred.bboxes, list) else pred.bboxes
-                                    
-                                    # Handle different bbox formats
-                                    if hasattr(bbox_obj, 'x1'):  # Object with attributes
-                                        bbox = {
-                                            'x1': int(bbox_obj.x1),
-                                            'y1': int(bbox_obj.y1),
-                                            'x2': int(bbox_obj.x2),
-                                            'y2': int(bbox_obj.y2)
-                                        }
-                                    elif isinstance(bbox_obj, (list, tuple)) and len(bbox_obj) >= 4:  # List/tuple format
-                                        bbox = {
-                                            'x1': int(bbox_obj[0]),
-                                            'y1': int(bbox_obj[1]),
-                                            'x2': int(bbox_obj[2]),
-                                            'y2': int(bbox_obj[3])
-                                        }
-                                    elif isinstance(bbox_obj, dict):  # Dictionary format
-                                        bbox = {
-                                            'x1': int(bbox_obj.get('x1', bbox_obj.get('left', 0))),
-                                            'y1': int(bbox_obj.get('y1', bbox_obj.get('top', 0))),
-                                            'x2': int(bbox_obj.get('x2', bbox_obj.get('right', 0))),
-                                            'y2': int(bbox_obj.get('y2', bbox_obj.get('bottom', 0)))
-                                        }
-                                    else:
-                                        print(f"   Unknown bbox format: {type(bbox_obj)}")
-                                        bbox = None
-                                except Exception as e:
-                                    print(f"   Bbox parsing error: {e}")
-                                    bbox = None
-                            
-                            detection_data = {
-                                'confidence': confidence,
-                                'label': getattr(pred, 'label_name', 'pothole'),
-                                'bbox': bbox,
-                                'gps_location': current_location,
-                                'timestamp': timestamp,
-                                'analysis_id': analysis_count
-                            }
-                            detections_data.append(detection_data)
+                    gray = cv2.cvtColor(opencv_frame, cv2.COLOR_BGR2GRAY)
+                    frame_hash = frame_dhash(gray)
                     
-                    if potholes_found > 0:
-                        detection_count += potholes_found
-                        print(f"   POTHOLE DETECTED! Found {potholes_found} pothole(s)")
-                        
-                        # Print detection details
-                        for i, detection in enumerate(detections_data):
-                            print(f"      Detection {i+1}: {detection['confidence']:.2f} confidence")
-                            if current_location:
-                                print(f"         GPS: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}")
-                        
-                        # Save detection image and data
-                        final_filename = f"pothole_{timestamp}.jpg"
-                        final_filepath = os.path.join(screenshots_dir, final_filename)
-                        os.rename(temp_filepath, final_filepath)
-                        
-                        # Save detailed JSON data
-                        data_filename = f"pothole_{timestamp}_data.json"
-                        data_filepath = os.path.join(logs_dir, data_filename)
-                        
-                        full_data = {
-                            'timestamp': timestamp,
-                            'analysis_id': analysis_count,
-                            'image_file': final_filename,
-                            'gps_location': current_location,
-                            'detections': detections_data,
-                            'total_detections': potholes_found,
-                            'camera_settings': {
-                                'width': 640,
-                                'height': 480,
-                                'camera_id': CAMERA_ID
-                            }
-                        }
-                        
-                        with open(data_filepath, 'w') as f:
-                            json.dump(full_data, f, indent=2)
+                    # Skip the remote call while parked or when the scene hasn't changed.
+                    # A reported speed decides on its own: while driving, a forward road view
+                    # (horizon, lane edges) hashes almost the same from frame to frame.
+                    speed = gps_tracker.get_speed()
+                    if speed is not None:
+                        is_unchanged = speed < MIN_ANALYSIS_SPEED
+                    else:
+                        is_unchanged = (last_submitted_hash is not None
+                                        and bin(frame_hash ^ last_submitted_hash).count('1') < DEDUPE_MAX_HAMMING_DISTANCE)
+                    
+                    # Skip the remote call when the frame has no pothole candidates
+                    is_candidate = False
+                    if not is_unchanged:
+                        is_candidate = not PREFILTER_ENABLED or has_pothole_candidates(gray)
+                        if is_candidate and prefilter_model is not None:
+                            is_candidate = prefilter_model.score(opencv_frame) >= PREFILTER_MIN_SCORE
+                    
+                    if is_unchanged:
+                        unchanged_count += 1
+                    elif not is_candidate:
+                        filtered_count += 1
+                    else:
+                        last_submitted_hash = frame_hash
+                        analysis_count += 1
+                        timestamp = datetime.fromtimestamp(current_time).strftime("%Y%m%d_%H%M%S_%f")[:-3]
                         
-                        # Log to daily file
-                        log_message = f"POTHOLE DETECTED - Count: {potholes_found}, Image: {final_filename}"
+                        print(f"Analysis {analysis_count} (Frame {frame_count}): {timestamp}")
                         if current_location:
-                            log_message += f", GPS: {current_location['latitude']:.6f},{current_location['longitude']:.6f}"
-                        log_to_daily_file(log_message)
-                        
-                        print(f"   Saved: {final_filename}")
-                        print(f"   Data: {data_filename}")
-                        
-                    else:
-                        print("   ✅ No potholes detected")
-                        log_to_daily_file(f"Frame analyzed - No detections (Analysis #{analysis_count})")
-                        if os.path.exists(temp_filepath):
-                            os.remove(temp_filepath)
-                else:
-                    print("   ✅ No potholes detected")
-                    log_to_daily_file(f"Frame analyzed - No detections (Analysis #{analysis_count})")
-                    if os.path.exists(temp_filepath):
-                        os.remove(temp_filepath)
+                            print(f"   Location: {current_location['latitude']:.6f}, {current_location['longitude']:.6f}")
                         
-            except Exception as e:
-                print(f"   ❌ Analysis failed: {e}")
-                log_to_daily_file(f"Analysis failed - Error: {str(e)}")
-                if 'temp_filepath' in locals() and os.path.exists(temp_filepath):
-                    os.remove(temp_filepath)
-            
-            # Print summary every 5 analyses
-            if analysis_count % 5 == 0:
-                summary_msg = f"Summary: {analysis_count} analyses, {detection_count} potholes found"
-                print(f" {summary_msg}")
-                log_to_daily_file(summary_msg)
+                        # Queue for analysis by Landing AI. The capture buffer is
+                        # reused and the overlay is drawn on it, so the job gets its own copy.
+                        inference.submit({
+                            'image': opencv_frame.copy(),
+                            'timestamp': timestamp,
+                            'location': current_location,
+                            'analysis_id': analysis_count
+                        })
+                
+                # Show live camera feed with GPS overlay
+                if SHOW_CAMERA:
+                    if frame_count % DISPLAY_EVERY_N_FRAMES == 0:
+                        overlay_key = (int(current_time * 2), analysis_count, detection_count)
+                        status_overlay.update(overlay_key, opencv_frame.shape,
+                                              lambda: status_lines(current_location, current_time, opencv_frame.shape[0]))
+                        status_overlay.blit(opencv_frame)
+                        cv2.imshow('Pothole Detection with GPS', opencv_frame)
+                    
+                    # Check for quit key
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == ord('q'):
+                        print("User pressed 'q' to quit")
+                        break
                 
     except KeyboardInterrupt:
         print(f"\nStopped by user")
@@ -489,31 +1233,39 @@ def capture_with_opencv_and_gps():
         print(f"❌ Error: {e}")
         log_to_daily_file(f"Session error: {str(e)}")
     finally:
+        frame_reader.stop()
         cap.release()
+        if prefilter_model is not None:
+            prefilter_model.close()
         if SHOW_CAMERA:
             cv2.destroyAllWindows()
         
         # Close GPS connections
+        gps_tracker.stop()
         if gps_tracker.serial_connection:
             gps_tracker.serial_connection.close()
         
         # Log session end
-        log_to_daily_file(f"Session ended - Total: {detection_count} potholes in {analysis_count} analyses")
+        log_to_daily_file(f"Session ended - Total: {detection_count} potholes in {analyzed_count} analyses")
+        
+        # Flush queued log messages and close the log file
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            handler.close()
     
     # Final summary
     print("\n" + "=" * 50)
     print(f"FINAL SUMMARY:")
     print(f"Total frames captured: {frame_count}")
-    print(f"Frames analyzed by Landing AI: {analysis_count}")
+    print(f"Frames skipped as unchanged/stationary: {unchanged_count}")
+    print(f"Frames skipped by local pre-filter: {filtered_count}")
+    print(f"Frames dropped (backlog full or shutdown): {dropped_count}")
+    print(f"Frames analyzed by Landing AI: {analyzed_count}")
+    print(f"Landing AI requests failed: {analysis_count - dropped_count - analyzed_count}")
     print(f"Potholes detected: {detection_count}")
-    if os.path.exists(screenshots_dir):
-        saved_images = len([f for f in os.listdir(screenshots_dir) if f.endswith('.jpg') and not f.startswith('temp_')])
-        print(f"Images saved: {saved_images}")
-    if os.path.exists(logs_dir):
-        data_files = len([f for f in os.listdir(logs_dir) if f.endswith('.json')])
-        log_files = len([f for f in os.listdir(logs_dir) if f.endswith('.log')])
-        print(f"Data files created: {data_files}")
-        print(f"Log files: {log_files}")
+    print(f"Images saved: {images_saved}")
+    print(f"Data files created: {data_files_created}")
+    print(f"Log file: {daily_log_filename}")
     print("=" * 50)
 
 def main():
@@ -540,8 +1292,8 @@ def test_camera_only():
     """Test camera without GPS"""
     print("Testing camera...")
     
-    cap = cv2.VideoCapture(CAMERA_ID)
-    if not cap.isOpened():
+    cap = open_camera()
+    if cap is None:
         print(f"❌ Cannot open camera {CAMERA_ID}")
         return
     